@@ -1,5 +1,7 @@
 """Git utilities for extracting repository context."""
 
+import configparser
+import functools
 import os
 import re
 import subprocess
@@ -7,7 +9,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+_REMOTE_URL_RE = re.compile(r"github\.com[:/]([^/]+)/([^/.]+?)(?:\.git)?$")
+
+
+@dataclass(slots=True, frozen=True)
 class GitContext:
     """Git repository context information."""
     commit_id: str
@@ -18,6 +23,7 @@ class GitContext:
     is_ci: bool
 
 
+@functools.lru_cache(maxsize=None)
 def get_git_context(
     commit_id: Optional[str] = None,
     owner: Optional[str] = None,
@@ -30,6 +36,9 @@ def get_git_context(
     1. Explicit CLI arguments
     2. GitHub Actions environment variables
     3. Local git commands
+
+    Results are memoized per process, since HEAD, origin and branch do not
+    change while the agent runs.
     """
     is_ci = os.environ.get("CI") == "true" or os.environ.get("GITHUB_ACTIONS") == "true"
 
@@ -48,21 +57,16 @@ def get_git_context(
     )
 
 
+@functools.lru_cache(maxsize=1)
 def _resolve_commit_id(explicit_commit: Optional[str] = None) -> str:
     if explicit_commit:
         return explicit_commit
     if os.environ.get("GITHUB_SHA"):
         return os.environ["GITHUB_SHA"]
-    try:
-        return subprocess.check_output(
-            ["git", "rev-parse", "HEAD"],
-            text=True,
-            stderr=subprocess.DEVNULL
-        ).strip()
-    except subprocess.CalledProcessError:
-        return "unknown"
+    return _read_git_state()[0]
 
 
+@functools.lru_cache(maxsize=1)
 def _resolve_owner_repo(
     explicit_owner: Optional[str] = None,
     explicit_repo: Optional[str] = None
@@ -75,37 +79,141 @@ def _resolve_owner_repo(
         parts = github_repository.split("/", 1)
         return parts[0], parts[1]
 
-    try:
-        remote_url = subprocess.check_output(
-            ["git", "remote", "get-url", "origin"],
-            text=True,
-            stderr=subprocess.DEVNULL
-        ).strip()
-        return _parse_remote_url(remote_url)
-    except subprocess.CalledProcessError:
+    remote_url = _read_git_state()[2]
+    if not remote_url:
         return "unknown", "unknown"
+    return _parse_remote_url(remote_url)
 
 
+@functools.lru_cache(maxsize=1)
 def _resolve_branch() -> str:
     if os.environ.get("GITHUB_REF_NAME"):
         return os.environ["GITHUB_REF_NAME"]
+    return _read_git_state()[1]
+
+
+@functools.lru_cache(maxsize=1)
+def _read_git_state() -> tuple[str, str, str]:
+    """Return (commit_id, branch, remote_url), preferring direct .git reads."""
+    state = _read_git_files()
+    if state is not None:
+        return state
+
+    # Commit and branch come from one rev-parse; origin is looked up on its
+    # own so an unborn branch or a missing remote doesn't mask the other.
+    head = _run_git("rev-parse", "HEAD", "--abbrev-ref", "HEAD")
+    lines = head.splitlines() if head is not None else []
+    if len(lines) == 2:
+        commit, branch = lines[0].strip(), lines[1].strip()
+    else:
+        commit, branch = "unknown", "unknown"
+    remote_url = (_run_git("remote", "get-url", "origin") or "").strip()
+    return commit, branch, remote_url
+
+
+def _run_git(*args: str) -> Optional[str]:
     try:
-        return subprocess.check_output(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+        return subprocess.run(
+            ["git", *args],
+            capture_output=True,
             text=True,
-            stderr=subprocess.DEVNULL
-        ).strip()
-    except subprocess.CalledProcessError:
-        return "unknown"
+            check=True
+        ).stdout
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
 
+def _read_git_files() -> Optional[tuple[str, str, str]]:
+    """
+    Read HEAD, refs and origin URL straight from the .git directory.
+
+    Returns None for layouts this does not handle, so the caller can fall
+    back to the git binary: GIT_DIR overrides, worktrees and submodules where
+    .git is a file, unborn branches, and any .git/config that can't give a
+    clean origin URL (no origin url, include/includeIf sections, repeated
+    sections or keys, inline comments). url.<base>.insteadOf rewrites, which
+    `git remote get-url` applies, are not handled: the origin URL is
+    returned as written in .git/config.
+    """
+    git_dir = _find_git_dir()
+    if git_dir is None:
+        return None
 
+    try:
+        with open(os.path.join(git_dir, "HEAD")) as f:
+            head = f.read().strip()
+        if head.startswith("ref: "):
+            ref = head[len("ref: "):]
+            commit = _read_ref(git_dir, ref)
+            if commit is None:
+                return None
+            branch = ref.removeprefix("refs/heads/")
+        else:
+            commit, branch = head, "HEAD"
+        remote_url = _read_origin_url(git_dir)
+        if remote_url is None:
+            return None
+    except (OSError, ValueError, configparser.Error):
+        # ValueError covers UnicodeDecodeError from non-UTF-8 files
+        return None
+
+    return commit, branch, remote_url
+
+
+def _find_git_dir() -> Optional[str]:
+    if "GIT_DIR" in os.environ:
+        return None
+    path = os.getcwd()
+    while True:
+        candidate = os.path.join(path, ".git")
+        if os.path.isdir(candidate):
+            return candidate
+        if os.path.exists(candidate):
+            return None
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _read_ref(git_dir: str, ref: str) -> Optional[str]:
+    try:
+        with open(os.path.join(git_dir, ref)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+
+    try:
+        with open(os.path.join(git_dir, "packed-refs")) as f:
+            for line in f:
+                sha, _, name = line.rstrip("\n").partition(" ")
+                if name == ref:
+                    return sha
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def _read_origin_url(git_dir: str) -> Optional[str]:
+    # strict=True raises on repeated sections/keys, where git's "first url
+    # wins" and configparser's "last one wins" would disagree
+    config = configparser.ConfigParser(strict=True, interpolation=None)
+    config.read(os.path.join(git_dir, "config"))
+    if any(
+        section == "include" or section.startswith("includeIf")
+        for section in config.sections()
+    ):
+        return None
+
+    url = config.get('remote "origin"', "url", fallback=None)
+    if not url or "#" in url or ";" in url:
+        return None
+    return url.strip('"')
+
+
+@functools.lru_cache(maxsize=1)
 def _parse_remote_url(url: str) -> tuple[str, str]:
-    patterns = [
-        r"github\.com[:/]([^/]+)/([^/.]+?)(?:\.git)?$",
-        r"github\.com[:/]([^/]+)/([^/.]+)$"
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1), match.group(2)
+    match = _REMOTE_URL_RE.search(url)
+    if match:
+        return match.group(1), match.group(2)
     return "unknown", "unknown"
@@ -1,8 +1,25 @@
 """MCP server configuration for Claude Agent SDK."""
 
+import functools
 import os
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+
+# Environment passed through to the MCP server: interpreter/loader paths
+# (setup-python exports LD_LIBRARY_PATH), proxy and CA settings in both
+# cases for httpx, and API keys. AIC_* covers the AI Defense keys and
+# endpoint settings; everything else stays in the parent.
+_SERVER_ENV_KEYS = frozenset({
+    "PATH", "HOME", "USER", "LANG", "LC_ALL", "TMPDIR",
+    "LD_LIBRARY_PATH", "VIRTUAL_ENV",
+    "CI", "GITHUB_ACTIONS",
+    "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY",
+    "http_proxy", "https_proxy", "no_proxy",
+    "SSL_CERT_FILE", "SSL_CERT_DIR", "REQUESTS_CA_BUNDLE",
+    "OPENAI_API_KEY", "ANTHROPIC_API_KEY",
+})
+_SERVER_ENV_PREFIXES = ("AIC_",)
 
 
 def get_mcp_config(base_dir: str = None) -> Dict[str, Any]:
@@ -22,6 +39,27 @@ def get_mcp_config(base_dir: str = None) -> Dict[str, Any]:
     if base_dir is None:
         base_dir = os.getcwd()
 
+    server_dir, server_python = _resolve_server_paths(base_dir)
+
+    return {
+        "ai-defense": {
+            "command": server_python,
+            "args": ["-m", "src.server"],
+            "env": {**_server_env(), "PYTHONPATH": server_dir},
+            "cwd": server_dir
+        }
+    }
+
+
+def _server_env() -> Dict[str, str]:
+    return {
+        key: value for key, value in os.environ.items()
+        if key in _SERVER_ENV_KEYS or key.startswith(_SERVER_ENV_PREFIXES)
+    }
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_server_paths(base_dir: str) -> Tuple[str, str]:
     # AI Defense MCP is cloned to .github/ai-defense-mcp during CI/CD
     server_dir = os.path.abspath(os.path.join(base_dir, ".github", "ai-defense-mcp"))
 
@@ -31,22 +69,15 @@ def get_mcp_config(base_dir: str = None) -> Dict[str, Any]:
             "Run: git clone https://github.com/nyasukun/ai-defense-mcp.git .github/ai-defense-mcp"
         )
 
-    # Detect python executable
+    # Detect python executable; os.access also rejects non-executable files
     venv_python = os.path.join(server_dir, ".venv", "bin", "python")
     project_venv = os.path.join(base_dir, ".venv", "bin", "python")
 
-    if os.path.exists(venv_python):
+    if os.access(venv_python, os.X_OK):
         server_python = venv_python
-    elif os.path.exists(project_venv):
+    elif os.access(project_venv, os.X_OK):
         server_python = project_venv
     else:
         server_python = sys.executable
 
-    return {
-        "ai-defense": {
-            "command": server_python,
-            "args": ["-m", "src.server"],
-            "env": {**os.environ, "PYTHONPATH": server_dir},
-            "cwd": server_dir
-        }
-    }
+    return server_dir, server_python
@@ -17,8 +17,10 @@ import asyncio
 import json
 import os
 import sys
+from contextlib import contextmanager
+from typing import Optional
 
-from claude_code_sdk import query, ClaudeCodeOptions, Message
+import orjson
 
 # Add script directory to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -69,6 +71,15 @@ Provide a structured summary at the end:
 - Never use force push or destructive git commands
 """
 
+DRY_RUN_MODE = """
+## MODE: DRY RUN
+Analyze only. Do NOT:
+- Modify any files
+- Call MCP tools
+- Create branches or PRs
+Just report what you would do.
+"""
+
 # All available tools
 TOOLS_FULL = [
     "Read",
@@ -109,19 +120,66 @@ def get_context_summary(working_dir: str, commit_id: str = None) -> str:
 
 def build_user_prompt(context: str, agent_prompt: str, dry_run: bool) -> str:
     """Build the full user prompt."""
-    mode = ""
-    if dry_run:
-        mode = """
-## MODE: DRY RUN
-Analyze only. Do NOT:
-- Modify any files
-- Call MCP tools
-- Create branches or PRs
-Just report what you would do.
-"""
+    mode = DRY_RUN_MODE if dry_run else ""
     return f"{context}\n{mode}\n{agent_prompt}"
 
 
+def extract_pr_url(text: str) -> Optional[str]:
+    """Return the URL from the last valid "PR URL:" line in text, if any."""
+    marker = "PR URL:"
+    start = text.rfind(marker)
+    while start >= 0:
+        # Only the last marker on a line counts, so the slice always ends at
+        # the newline and never runs into another marker.
+        end = text.find("\n", start)
+        url = text[start + len(marker):end if end >= 0 else None].strip()
+        if url.startswith("http"):
+            return url
+        line_start = text.rfind("\n", 0, start) + 1
+        start = text.rfind(marker, 0, line_start)
+    return None
+
+
+@contextmanager
+def open_report(output_file: Optional[str]):
+    """Open the report file for writing, or yield None if none was requested."""
+    if not output_file:
+        yield None
+        return
+    report = open(output_file, "wb")
+    try:
+        yield report
+    finally:
+        # A record that failed to flush stays buffered and fails again here
+        try:
+            report.close()
+        except OSError as e:
+            print(f"Warning: failed to close report: {e}", file=sys.stderr)
+
+
+def write_record(report, record: dict) -> None:
+    """
+    Append one NDJSON record to the report file, if one is open.
+
+    Write failures are logged rather than raised so the report can never
+    abort the agent stream.
+    """
+    if report is None:
+        return
+    try:
+        line = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    except TypeError:
+        # orjson rejects lone surrogates; stdlib json escapes them instead.
+        # Message records are printed first, which already fails on such
+        # text, so in practice this only covers the final result record.
+        line = json.dumps(record).encode("utf-8") + b"\n"
+    try:
+        report.write(line)
+        report.flush()
+    except OSError as e:
+        print(f"Warning: failed to write report record: {e}", file=sys.stderr)
+
+
 async def run_agent(
     working_dir: str,
     commit_id: str = None,
@@ -145,9 +203,19 @@ async def run_agent(
     except FileNotFoundError as e:
         return {"status": "error", "error": str(e)}
 
+    # Imported here so runs that exit early don't pay for the SDK's import tree
+    from claude_code_sdk import (
+        query,
+        AssistantMessage,
+        ClaudeCodeOptions,
+        ResultMessage,
+        SystemMessage,
+        TextBlock,
+        UserMessage,
+    )
+
     result = {
         "status": "running",
-        "messages": [],
         "final_output": None,
         "pr_url": None
     }
@@ -159,48 +227,48 @@ async def run_agent(
     print(f"Dry Run: {dry_run}")
     print("-" * 60)
 
-    try:
-        options = ClaudeCodeOptions(
-            cwd=working_dir,
-            system_prompt=SYSTEM_PROMPT,
-            allowed_tools=tools,
-            permission_mode="default",
-            mcp_servers=mcp_servers
-        )
-
-        async for message in query(prompt=user_prompt, options=options):
-            if isinstance(message, Message):
-                if hasattr(message, 'content'):
+    # Messages are streamed to the report as NDJSON instead of being kept
+    # in memory, followed by one final "result" record. write_record flushes
+    # each record, so write errors surface there rather than at close.
+    with open_report(output_file) as report:
+        try:
+            options = ClaudeCodeOptions(
+                cwd=working_dir,
+                system_prompt=SYSTEM_PROMPT,
+                allowed_tools=tools,
+                permission_mode="default",
+                mcp_servers=mcp_servers
+            )
+
+            async for message in query(prompt=user_prompt, options=options):
+                if isinstance(message, AssistantMessage):
                     for block in message.content:
-                        if hasattr(block, 'text'):
+                        if isinstance(block, TextBlock):
                             text = block.text
                             print(text)
-                            result["messages"].append(text)
+                            write_record(report, {"type": "message", "data": text})
                             if "## Summary" in text:
                                 result["final_output"] = text
-                            if "PR URL:" in text:
-                                for line in text.split("\n"):
-                                    if "PR URL:" in line:
-                                        url = line.split("PR URL:")[-1].strip()
-                                        if url.startswith("http"):
-                                            result["pr_url"] = url
-                elif hasattr(message, 'result'):
+                            pr_url = extract_pr_url(text)
+                            if pr_url:
+                                result["pr_url"] = pr_url
+                elif isinstance(message, ResultMessage):
                     result["final_output"] = message.result
-            else:
-                msg_str = str(message)
-                print(msg_str)
-                result["messages"].append(msg_str)
+                elif not isinstance(message, (UserMessage, SystemMessage)):
+                    msg_str = str(message)
+                    print(msg_str)
+                    write_record(report, {"type": "message", "data": msg_str})
 
-        result["status"] = "completed"
+            result["status"] = "completed"
 
-    except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
-        result["status"] = "error"
-        result["error"] = str(e)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            result["status"] = "error"
+            result["error"] = str(e)
+
+        write_record(report, {"type": "result", **result})
 
     if output_file:
-        with open(output_file, "w") as f:
-            json.dump(result, f, indent=2)
         print(f"\nResults written to: {output_file}")
 
     return result
@@ -212,7 +280,7 @@ async def main() -> int:
     parser.add_argument("--target-dir", default=".", help="Directory to analyze")
     parser.add_argument("--commit-id", help="Explicit commit ID")
     parser.add_argument("--dry-run", action="store_true", help="Analyze only")
-    parser.add_argument("--output", help="Output file (JSON)")
+    parser.add_argument("--output", help="Output report file (NDJSON)")
     args = parser.parse_args()
 
     target_dir = os.path.abspath(args.target_dir)